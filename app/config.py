@@ -4,6 +4,7 @@ Uses environment variables with sensible defaults.
 """
 
 import os
+from functools import cached_property
 from pathlib import Path
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
@@ -19,7 +20,7 @@ class Settings(BaseSettings):
     # CORS - stored as comma-separated string in .env
     CORS_ORIGINS: str = "http://localhost:5173,http://localhost:3000,https://*.vercel.app"
     
-    @property
+    @cached_property
     def cors_origins_list(self) -> list[str]:
         """Return CORS origins as a list."""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip()]
@@ -35,6 +36,8 @@ class Settings(BaseSettings):
         "FIREBASE_CREDENTIALS_PATH", 
         str(BASE_DIR / "firebase-credentials.json")
     )
+    # Number of Firestore clients (gRPC channels) to spread requests across
+    FIRESTORE_POOL_SIZE: int = int(os.getenv("FIRESTORE_POOL_SIZE", "4"))
     
     # Whisper settings
     WHISPER_MODEL: str = os.getenv("WHISPER_MODEL", "base")
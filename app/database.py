@@ -1,30 +1,61 @@
 """
 Firestore database integration for LinguaAI.
-Handles connection and provides helper functions for user data.
+Handles connection and provides async helper functions for user data.
 """
 
 import firebase_admin
-from firebase_admin import credentials, firestore
+from firebase_admin import credentials, firestore_async
+from google.api_core.exceptions import NotFound
 from datetime import datetime, timezone
 from typing import Optional
+import logging
 import os
+import random
+import threading
+import time
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 # Initialize Firebase Admin SDK
 _firebase_app = None
 _db = None
+_db_pool: list = []
+# Set once initialization has been attempted, so mock mode doesn't retry per request
+_initialized = False
+_init_lock = threading.Lock()
+
+# Short-lived cache of user documents: firebase_uid -> (expires_at, user)
+USER_CACHE_TTL_SECONDS = 10
+USER_CACHE_MAX_SIZE = 4096
+_user_cache: dict = {}
 
 
 def init_firebase():
-    """Initialize Firebase Admin SDK with credentials."""
-    global _firebase_app, _db
-    import json
+    """
+    Initialize Firebase Admin SDK with credentials.
+    Runs once per process; later calls return the cached client.
+    """
+    global _initialized
     
-    if _firebase_app is not None:
+    if _initialized:
         return _db
     
+    with _init_lock:
+        if not _initialized:
+            _connect_firebase()
+            _initialized = True
+    
+    return _db
+
+
+def _connect_firebase():
+    """Load credentials and create the async Firestore clients."""
+    global _firebase_app, _db
+    import json
+    
     cred = None
     
     # Option 1: Check for inline JSON credentials (preferred for cloud deployments)
@@ -33,9 +64,9 @@ def init_firebase():
         try:
             cred_dict = json.loads(cred_json)
             cred = credentials.Certificate(cred_dict)
-            print("Using inline Firebase credentials from environment variable")
+            logger.info("Using inline Firebase credentials from environment variable")
         except Exception as e:
-            print(f"Warning: Could not parse FIREBASE_CREDENTIALS_JSON: {e}")
+            logger.warning("Could not parse FIREBASE_CREDENTIALS_JSON: %s", e)
     
     # Option 2: Check for credentials file
     if cred is None:
@@ -43,51 +74,77 @@ def init_firebase():
         if os.path.exists(cred_path):
             try:
                 cred = credentials.Certificate(cred_path)
-                print(f"Using Firebase credentials from file: {cred_path}")
+                logger.info("Using Firebase credentials from file: %s", cred_path)
             except Exception as e:
-                print(f"Warning: Could not load credentials file: {e}")
+                logger.warning("Could not load credentials file: %s", e)
     
     # Initialize Firebase if credentials found
     if cred:
         try:
             _firebase_app = firebase_admin.initialize_app(cred)
-            _db = firestore.client()
-            print("Firebase initialized successfully")
+            _db = firestore_async.client()
+            _db_pool.append(_db)
+            
+            # Extra clients each get their own gRPC channel
+            for i in range(1, settings.FIRESTORE_POOL_SIZE):
+                pool_app = firebase_admin.initialize_app(cred, name=f"pool-{i}")
+                _db_pool.append(firestore_async.client(app=pool_app))
+            
+            logger.info("Firebase initialized successfully (%d Firestore clients)", len(_db_pool))
             return _db
         except Exception as e:
-            print(f"Warning: Could not initialize Firebase: {e}")
-            print("Running in mock mode - no data will be persisted")
+            logger.warning("Could not initialize Firebase: %s", e)
+            logger.warning("Running in mock mode - no data will be persisted")
             return None
     else:
-        print("Warning: No Firebase credentials found")
-        print("Set FIREBASE_CREDENTIALS_JSON env var or provide firebase-credentials.json file")
-        print("Running in mock mode - no data will be persisted")
+        logger.warning("No Firebase credentials found")
+        logger.warning("Set FIREBASE_CREDENTIALS_JSON env var or provide firebase-credentials.json file")
+        logger.warning("Running in mock mode - no data will be persisted")
         return None
 
 
 def get_db():
-    """Get Firestore database client."""
-    global _db
-    if _db is None:
+    """Get an async Firestore database client from the pool."""
+    if not _initialized:
         init_firebase()
-    return _db
+    if not _db_pool:
+        return None
+    return _db_pool[random.randrange(len(_db_pool))]
 
 
 # ============== User Operations ==============
 
-def get_user(firebase_uid: str) -> Optional[dict]:
-    """Get user by Firebase UID."""
+async def get_user(firebase_uid: str) -> Optional[dict]:
+    """
+    Get user by Firebase UID.
+    Results are cached for a few seconds and invalidated on writes.
+    """
+    now = time.monotonic()
+    cached = _user_cache.get(firebase_uid)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    
     db = get_db()
     if db is None:
         return None
     
-    doc = db.collection("users").document(firebase_uid).get()
+    doc = await db.collection("users").document(firebase_uid).get()
     if doc.exists:
-        return {"id": doc.id, **doc.to_dict()}
+        user = {"id": doc.id, **doc.to_dict()}
+        if len(_user_cache) >= USER_CACHE_MAX_SIZE:
+            # Evict the oldest entry
+            _user_cache.pop(next(iter(_user_cache)), None)
+        _user_cache[firebase_uid] = (now + USER_CACHE_TTL_SECONDS, user)
+        return user
     return None
 
 
-def create_user(firebase_uid: str, email: str, display_name: str = None) -> dict:
+def invalidate_user_cache(firebase_uid: str):
+    """Drop a cached user document after it has been written."""
+    _user_cache.pop(firebase_uid, None)
+
+
+async def create_user(firebase_uid: str, email: str, display_name: str = None) -> dict:
     """Create a new user with initial stats."""
     db = get_db()
     if db is None:
@@ -113,34 +170,40 @@ def create_user(firebase_uid: str, email: str, display_name: str = None) -> dict
         "badges": [],
     }
     
-    db.collection("users").document(firebase_uid).set(user_data)
+    await db.collection("users").document(firebase_uid).set(user_data)
+    invalidate_user_cache(firebase_uid)
     return {"id": firebase_uid, **user_data}
 
 
-def get_or_create_user(firebase_uid: str, email: str, display_name: str = None) -> dict:
-    """Get existing user or create new one."""
-    user = get_user(firebase_uid)
-    if user:
-        return user
-    return create_user(firebase_uid, email, display_name)
-
-
-def update_user_stats(firebase_uid: str, xp_earned: int, mode: str) -> dict:
-    """Update user stats after a practice session."""
+async def _user_exists(firebase_uid: str) -> bool:
+    """Check whether a user document exists without fetching its fields."""
     db = get_db()
     if db is None:
-        return {"error": "Database not available"}
-    
-    user_ref = db.collection("users").document(firebase_uid)
-    user_doc = user_ref.get()
-    
-    if not user_doc.exists:
-        return {"error": "User not found"}
-    
-    user_data = user_doc.to_dict()
-    stats = user_data.get("stats", {})
-    
-    now = datetime.now(timezone.utc)
+        return False
+    
+    users = db.collection("users")
+    query = (
+        users.where(filter=firestore_async.FieldFilter("__name__", "==", users.document(firebase_uid)))
+        .select(["__name__"])
+        .limit(1)
+    )
+    async for _ in query.stream():
+        return True
+    return False
+
+
+async def get_or_create_user(firebase_uid: str, email: str, display_name: str = None) -> dict:
+    """
+    Get existing user or create new one.
+    For existing users only the ID is returned; use get_user() for the full profile.
+    """
+    if await _user_exists(firebase_uid):
+        return {"id": firebase_uid}
+    return await create_user(firebase_uid, email, display_name)
+
+
+def _apply_session_stats(stats: dict, xp_earned: int, mode: str, now: datetime) -> dict:
+    """Apply XP, level, streak and session count changes to a stats dict."""
     today = now.date()
     
     # Update XP and level
@@ -183,98 +246,224 @@ def update_user_stats(firebase_uid: str, xp_earned: int, mode: str) -> dict:
     stats["streak"] = new_streak
     stats["last_practice_date"] = now
     
-    # Check for new badges
+    return stats
+
+
+@firestore_async.async_transactional
+async def _commit_session_transaction(
+    transaction,
+    user_ref,
+    session_ref,
+    session_data: Optional[dict],
+    mode: str,
+    xp_earned: int,
+    score: Optional[int],
+) -> dict:
+    """Read the user once and write stats, best score and session log in one commit."""
+    user_doc = await user_ref.get(transaction=transaction)
+    
+    if session_ref is not None:
+        transaction.set(session_ref, session_data)
+    
+    if not user_doc.exists:
+        return {"error": "User not found"}
+    
+    user_data = user_doc.to_dict()
+    stats = user_data.get("stats", {})
     badges = user_data.get("badges", [])
-    new_badges = check_for_badges(stats, badges)
+    now = datetime.now(timezone.utc)
     
-    user_ref.update({
-        "stats": stats,
-        "badges": new_badges,
+    old_level = stats.get("level", 1)
+    
+    # Counters are applied server-side so they never depend on a stale read
+    updates = {
+        "stats.total_xp": firestore_async.Increment(xp_earned),
         "updated_at": now,
-    })
+    }
+    if mode in ("pronunciation", "spelling"):
+        updates[f"stats.{mode}_sessions"] = firestore_async.Increment(1)
+    
+    if score is not None:
+        field = f"best_{mode}_score"
+        updates[f"stats.{field}"] = firestore_async.Maximum(score)
+        stats[field] = max(stats.get(field, 0), score)
+    
+    stats = _apply_session_stats(stats, xp_earned, mode, now)
+    updates["stats.streak"] = stats["streak"]
+    updates["stats.last_practice_date"] = now
+    if stats["level"] != old_level:
+        updates["stats.level"] = stats["level"]
+    
+    # Only append badges that were not already earned
+    new_badges = check_for_badges(stats, badges)
+    earned_ids = {b.get("id") for b in badges}
+    added_badges = [b for b in new_badges if b["id"] not in earned_ids]
+    if added_badges:
+        updates["badges"] = firestore_async.ArrayUnion(added_badges)
+    
+    transaction.update(user_ref, updates)
     
     return {
-        "total_xp": new_total_xp,
-        "level": new_level,
-        "streak": new_streak,
+        "total_xp": stats["total_xp"],
+        "level": stats["level"],
+        "streak": stats["streak"],
         "badges": new_badges,
         "xp_earned": xp_earned,
     }
 
 
-def update_best_score(firebase_uid: str, mode: str, score: int):
-    """Update best score if new score is higher."""
+async def _commit_session_batch(db, user_ref, session_ref, session_data: Optional[dict], mode: str, score: Optional[int]) -> dict:
+    """Write best score and session log without reading the user document."""
+    batch = db.batch()
+    
+    if score is not None:
+        batch.update(user_ref, {f"stats.best_{mode}_score": firestore_async.Maximum(score)})
+    if session_ref is not None:
+        batch.set(session_ref, session_data)
+    
+    try:
+        await batch.commit()
+    except NotFound:
+        # User document missing: keep the session log anyway
+        if session_ref is not None:
+            await session_ref.set(session_data)
+        return {"error": "User not found"}
+    
+    return {}
+
+
+async def commit_session(
+    firebase_uid: str,
+    mode: str,
+    word: str = None,
+    xp_earned: int = None,
+    score: int = None,
+    details: dict = None,
+) -> dict:
+    """
+    Record a practice session in a single Firestore commit.
+    
+    - **xp_earned**: if given, updates XP, level, streak, session count and badges
+    - **score**: if given, updates the best score for the mode
+    - **word**: if given, logs the session to `practice_sessions`
+    
+    XP, session counts and best scores are written as server-side transforms.
+    The user document is only read (inside a transaction) when `xp_earned` is
+    given, since streak and badges depend on the current stats.
+    """
     db = get_db()
     if db is None:
-        return
+        return {"error": "Database not available"}
     
     user_ref = db.collection("users").document(firebase_uid)
-    user_doc = user_ref.get()
     
-    if not user_doc.exists:
-        return
-    
-    user_data = user_doc.to_dict()
-    stats = user_data.get("stats", {})
-    
-    field = f"best_{mode}_score"
-    current_best = stats.get(field, 0)
-    
-    if score > current_best:
-        stats[field] = score
-        user_ref.update({"stats": stats})
+    session_ref = None
+    session_data = None
+    if word is not None:
+        session_ref = db.collection("practice_sessions").document()
+        session_data = {
+            "user_id": firebase_uid,
+            "mode": mode,
+            "word": word,
+            "score": score,
+            "details": details or {},
+            "created_at": datetime.now(timezone.utc),
+        }
+    
+    if xp_earned is None:
+        if score is None and session_ref is None:
+            return {}
+        result = await _commit_session_batch(db, user_ref, session_ref, session_data, mode, score)
+    else:
+        result = await _commit_session_transaction(
+            db.transaction(),
+            user_ref,
+            session_ref,
+            session_data,
+            mode,
+            xp_earned,
+            score,
+        )
+    
+    invalidate_user_cache(firebase_uid)
+    return result
+
+
+async def update_user_stats(firebase_uid: str, xp_earned: int, mode: str) -> dict:
+    """Update user stats after a practice session."""
+    return await commit_session(firebase_uid, mode, xp_earned=xp_earned)
+
+
+async def update_best_score(firebase_uid: str, mode: str, score: int):
+    """Update best score if new score is higher."""
+    await commit_session(firebase_uid, mode, score=score)
+
+
+# (badge_id, condition, name, description); conditions take the stats view
+# built in check_for_badges
+BADGE_DEFS = (
+    # Immediate/Beginner badges
+    ("first_session", lambda s: s["total_sessions"] >= 1, "🎯 First Session", "Completed your first practice!"),
+    ("getting_started", lambda s: s["total_xp"] >= 10, "🚀 Getting Started", "Earned 10 XP"),
+    ("first_steps", lambda s: s["total_xp"] >= 100, "👣 First Steps", "Earned 100 XP"),
+    ("xp_500", lambda s: s["total_xp"] >= 500, "⭐ XP Hunter", "Earned 500 XP"),
+    
+    # Session badges
+    ("five_sessions", lambda s: s["total_sessions"] >= 5, "🎮 Dedicated", "Completed 5 sessions"),
+    ("ten_sessions", lambda s: s["total_sessions"] >= 10, "🔥 On Fire", "Completed 10 sessions"),
+    ("century", lambda s: s["total_sessions"] >= 100, "💯 Century", "Completed 100 sessions"),
+    
+    # Streak badges
+    ("streak_3", lambda s: s["streak"] >= 3, "📅 3 Day Streak", "3 day practice streak"),
+    ("streak_week", lambda s: s["streak"] >= 7, "🗓️ Week Warrior", "7 day streak"),
+    ("streak_month", lambda s: s["streak"] >= 30, "📆 Monthly Master", "30 day streak"),
+    
+    # Level badges
+    ("level_2", lambda s: s["level"] >= 2, "🌱 Level 2", "Reached level 2"),
+    ("level_5", lambda s: s["level"] >= 5, "🌟 Rising Star", "Reached level 5"),
+    ("level_10", lambda s: s["level"] >= 10, "👑 Expert", "Reached level 10"),
+    
+    # Mode-specific badges
+    ("pronunciation_first", lambda s: s["pronunciation_sessions"] >= 1, "🎤 Voice Activated", "First pronunciation practice"),
+    ("spelling_first", lambda s: s["spelling_sessions"] >= 1, "📝 Wordsmith", "First spelling practice"),
+    ("perfect_pronunciation", lambda s: s["best_pronunciation_score"] >= 100, "🏆 Perfect Pronunciation", "100% pronunciation score"),
+    ("perfect_spelling", lambda s: s["best_spelling_score"] >= 100, "🏅 Spelling Bee", "100% spelling score"),
+)
 
 
 def check_for_badges(stats: dict, current_badges: list) -> list:
     """Check if user has earned any new badges."""
-    badges = current_badges.copy()
+    earned = {b.get("id"): b for b in current_badges}
+    now = datetime.now(timezone.utc)
     
-    total_sessions = stats.get("pronunciation_sessions", 0) + stats.get("spelling_sessions", 0)
+    pronunciation_sessions = stats.get("pronunciation_sessions", 0)
+    spelling_sessions = stats.get("spelling_sessions", 0)
+    stats_view = {
+        "total_sessions": pronunciation_sessions + spelling_sessions,
+        "total_xp": stats.get("total_xp", 0),
+        "streak": stats.get("streak", 0),
+        "level": stats.get("level", 1),
+        "pronunciation_sessions": pronunciation_sessions,
+        "spelling_sessions": spelling_sessions,
+        "best_pronunciation_score": stats.get("best_pronunciation_score", 0),
+        "best_spelling_score": stats.get("best_spelling_score", 0),
+    }
     
-    badge_conditions = [
-        # Immediate/Beginner badges
-        ("first_session", total_sessions >= 1, "🎯 First Session", "Completed your first practice!"),
-        ("getting_started", stats.get("total_xp", 0) >= 10, "🚀 Getting Started", "Earned 10 XP"),
-        ("first_steps", stats.get("total_xp", 0) >= 100, "👣 First Steps", "Earned 100 XP"),
-        ("xp_500", stats.get("total_xp", 0) >= 500, "⭐ XP Hunter", "Earned 500 XP"),
-        
-        # Session badges
-        ("five_sessions", total_sessions >= 5, "🎮 Dedicated", "Completed 5 sessions"),
-        ("ten_sessions", total_sessions >= 10, "🔥 On Fire", "Completed 10 sessions"),
-        ("century", total_sessions >= 100, "💯 Century", "Completed 100 sessions"),
-        
-        # Streak badges
-        ("streak_3", stats.get("streak", 0) >= 3, "📅 3 Day Streak", "3 day practice streak"),
-        ("streak_week", stats.get("streak", 0) >= 7, "🗓️ Week Warrior", "7 day streak"),
-        ("streak_month", stats.get("streak", 0) >= 30, "📆 Monthly Master", "30 day streak"),
-        
-        # Level badges
-        ("level_2", stats.get("level", 1) >= 2, "🌱 Level 2", "Reached level 2"),
-        ("level_5", stats.get("level", 1) >= 5, "🌟 Rising Star", "Reached level 5"),
-        ("level_10", stats.get("level", 1) >= 10, "👑 Expert", "Reached level 10"),
-        
-        # Mode-specific badges
-        ("pronunciation_first", stats.get("pronunciation_sessions", 0) >= 1, "🎤 Voice Activated", "First pronunciation practice"),
-        ("spelling_first", stats.get("spelling_sessions", 0) >= 1, "📝 Wordsmith", "First spelling practice"),
-        ("perfect_pronunciation", stats.get("best_pronunciation_score", 0) >= 100, "🏆 Perfect Pronunciation", "100% pronunciation score"),
-        ("perfect_spelling", stats.get("best_spelling_score", 0) >= 100, "🏅 Spelling Bee", "100% spelling score"),
-    ]
-    
-    for badge_id, condition, name, description in badge_conditions:
-        if condition and badge_id not in [b.get("id") for b in badges]:
-            badges.append({
+    for badge_id, condition, name, description in BADGE_DEFS:
+        if badge_id not in earned and condition(stats_view):
+            earned[badge_id] = {
                 "id": badge_id,
                 "name": name,
                 "description": description,
-                "earned_at": datetime.now(timezone.utc),
-            })
+                "earned_at": now,
+            }
     
-    return badges
+    return list(earned.values())
 
 
 # ============== Practice Session Logging ==============
 
-def log_practice_session(firebase_uid: str, mode: str, word: str, score: int, details: dict = None):
+async def log_practice_session(firebase_uid: str, mode: str, word: str, score: int, details: dict = None):
     """Log a practice session for analytics."""
     db = get_db()
     if db is None:
@@ -289,4 +478,4 @@ def log_practice_session(firebase_uid: str, mode: str, word: str, score: int, de
         "created_at": datetime.now(timezone.utc),
     }
     
-    db.collection("practice_sessions").add(session_data)
+    await db.collection("practice_sessions").add(session_data)
@@ -8,58 +8,87 @@ An AI-powered language learning API with:
 - Firestore database
 """
 
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config import settings
 from app.database import init_firebase
 from app.services.word_service import word_service
 from app.services.whisper_service import whisper_service
 from app.services.tts_service import tts_service
+from app.services.scoring_service import scoring_service
 from app.routers import words, pronunciation, spelling, users
 
+logging.basicConfig(
+    level=logging.DEBUG if settings.DEBUG else logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def _report_load_error(name: str):
+    """Build a done-callback that reports a failed background model load."""
+    def callback(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Could not load %s model: %s", name, task.exception())
+    return callback
+
+
+def _model_status(service) -> str:
+    """Report whether a model service is ready, still loading, or failed to load."""
+    if service._loaded:
+        return "ready"
+    if service._load_task is not None and not service._load_task.done():
+        return "loading"
+    return "unavailable"
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Lifespan events for startup and shutdown.
-    Load models on startup to avoid cold-start latency.
+    Models are loaded in the background so the server is ready immediately.
     """
-    print("=" * 50)
-    print("Starting Fluento Backend...")
-    print("=" * 50)
+    logger.info("Starting Fluento Backend...")
+    
+    # Default pool for blocking work offloaded with asyncio.to_thread
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=32))
     
     # Initialize Firebase
-    print("\n[1/4] Initializing Firebase...")
+    logger.info("[1/4] Initializing Firebase...")
     init_firebase()
     
     # Load word dataset
-    print("\n[2/4] Loading word dataset...")
+    logger.info("[2/4] Loading word dataset...")
     word_service.load_words()
     
-    # Load Whisper model
-    print("\n[3/4] Loading Whisper model...")
-    try:
-        whisper_service.load_model()
-    except Exception as e:
-        print(f"Warning: Could not load Whisper model: {e}")
+    # Phonemize every target word in the background so scoring skips espeak
+    scoring_service.start_precomputing(word_service.word_texts)
+    
+    # Load the Whisper model in the background so requests are served right
+    # away; the pronunciation endpoint waits for it to finish loading
+    logger.info("[3/4] Loading Whisper model in background...")
+    whisper_service.start_loading().add_done_callback(_report_load_error("Whisper"))
+    
+    # gTTS has no model to load
+    logger.info("[4/4] Loading TTS model...")
+    tts_service.load_model()
     
-    # Load TTS model
-    print("\n[4/4] Loading TTS model...")
-    try:
-        tts_service.load_model()
-    except Exception as e:
-        print(f"Warning: Could not load TTS model: {e}")
+    # Fetch audio for today's words ahead of the spelling game; the whole
+    # dataset is too large to pull from Google TTS without being rate limited
+    tts_service.start_precomputing([w["word"] for w in word_service.get_daily_words()])
     
-    print("\n" + "=" * 50)
-    print("Fluento Backend Ready!")
-    print("=" * 50)
+    logger.info("Fluento Backend Ready!")
     
     yield
     
     # Cleanup on shutdown
-    print("Shutting down Fluento Backend...")
+    logger.info("Shutting down Fluento Backend...")
 
 
 # Create FastAPI app
@@ -67,7 +96,8 @@ app = FastAPI(
     title="Fluento API",
     description="AI-powered language learning API with pronunciation practice and spelling games",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -103,8 +133,8 @@ async def health():
         "status": "healthy",
         "services": {
             "words": word_service._loaded,
-            "whisper": whisper_service._loaded,
-            "tts": tts_service._loaded,
+            "whisper": _model_status(whisper_service),
+            "tts": _model_status(tts_service),
         },
         "word_count": word_service.get_word_count()
     }
@@ -82,6 +82,13 @@ class UpdateStatsRequest(BaseModel):
     mode: str = Field(pattern="^(pronunciation|spelling)$")
 
 
+class LogSessionRequest(BaseModel):
+    """Request schema for logging a practice session."""
+    word: str
+    mode: str = Field(pattern="^(pronunciation|spelling)$")
+    score: int = Field(ge=0, le=100)
+
+
 class UpdateStatsResponse(BaseModel):
     """Response schema for stats update."""
     total_xp: int
@@ -2,6 +2,8 @@
 Pronunciation router for evaluating spoken words.
 """
 
+import asyncio
+import re
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
 from app.models.schemas import PronunciationEvaluateResponse
 from app.services.whisper_service import whisper_service
@@ -10,6 +12,9 @@ from app.config import settings
 
 router = APIRouter(prefix="/pronunciation", tags=["Pronunciation"])
 
+# Content types accepted for uploaded recordings
+_ALLOWED_CONTENT_TYPE = re.compile(r"audio|webm|wav|mp3|ogg")
+
 
 @router.post("/evaluate", response_model=PronunciationEvaluateResponse)
 async def evaluate_pronunciation(
@@ -26,33 +31,40 @@ async def evaluate_pronunciation(
     """
     # Validate file type
     content_type = audio_file.content_type or ""
-    if not any(t in content_type for t in ["audio", "webm", "wav", "mp3", "ogg"]):
+    if not _ALLOWED_CONTENT_TYPE.search(content_type):
         raise HTTPException(
             status_code=400,
             detail=f"Invalid file type: {content_type}. Allowed: audio/wav, audio/webm, audio/mp3, audio/ogg"
         )
     
-    # Read audio content
-    audio_content = await audio_file.read()
-    
-    # Check file size
+    # Check file size. The upload is already spooled to disk by the multipart
+    # parser, so it is never read into memory as a whole.
     max_size = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
-    if len(audio_content) > max_size:
+    if audio_file.size is not None and audio_file.size > max_size:
         raise HTTPException(
-            status_code=400,
+            status_code=413,
             detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE_MB}MB"
         )
     
-    # Get file extension
-    filename = audio_file.filename or "audio.webm"
-    suffix = "." + filename.split(".")[-1] if "." in filename else ".webm"
+    # Wait for the background model load; if it failed, report the service as
+    # unavailable instead of loading the model on the event loop
+    try:
+        await whisper_service.wait_until_loaded()
+    except Exception as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Speech recognition is unavailable: {str(e)}"
+        )
     
     try:
-        # Transcribe audio
-        recognized_text = whisper_service.transcribe_bytes(audio_content, suffix=suffix)
+        # Transcribe audio, off the event loop
+        recognized_text = await asyncio.to_thread(
+            whisper_service.transcribe_file, audio_file.file
+        )
         
-        # Calculate score
-        result = scoring_service.calculate_pronunciation_score(
+        # Calculate score (espeak runs for words outside the phoneme cache)
+        result = await asyncio.to_thread(
+            scoring_service.calculate_pronunciation_score,
             recognized_text=recognized_text,
             target_word=target_word
         )
@@ -2,7 +2,9 @@
 Spelling router for evaluating typed spelling attempts.
 """
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Header, Response
 from fastapi.responses import FileResponse
 from app.models.schemas import SpellingEvaluateRequest, SpellingEvaluateResponse, TTSGenerateRequest
 from app.services.scoring_service import scoring_service
@@ -11,6 +13,15 @@ from app.services.tts_service import tts_service
 router = APIRouter(prefix="/spelling", tags=["Spelling"])
 
 
+def _tts_cache_headers(word: str) -> dict:
+    """HTTP caching headers for a word's audio; the audio for a word never changes."""
+    etag = tts_service.word_hash(word)
+    return {
+        "Cache-Control": "public, max-age=604800, immutable",
+        "ETag": f'"{etag}"',
+    }
+
+
 @router.post("/evaluate", response_model=SpellingEvaluateResponse)
 async def evaluate_spelling(request: SpellingEvaluateRequest):
     """
@@ -62,7 +73,7 @@ async def generate_tts(request: TTSGenerateRequest):
         )
     
     try:
-        audio_path = tts_service.get_audio_path(request.word)
+        audio_path = await asyncio.to_thread(tts_service.get_audio_path, request.word)
         
         if audio_path is None or not audio_path.exists():
             raise HTTPException(
@@ -73,7 +84,8 @@ async def generate_tts(request: TTSGenerateRequest):
         return FileResponse(
             path=str(audio_path),
             media_type="audio/mpeg",
-            filename=f"{request.word}.mp3"
+            filename=f"{request.word}.mp3",
+            headers=_tts_cache_headers(request.word)
         )
         
     except Exception as e:
@@ -84,16 +96,23 @@ async def generate_tts(request: TTSGenerateRequest):
 
 
 @router.get("/tts/{word}")
-async def get_tts(word: str):
+async def get_tts(
+    word: str,
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Get text-to-speech audio for a word (GET method).
     
     - **word**: The word to convert to speech
     
-    Returns the audio file.
+    Returns the audio file, or 304 if the client already has it.
     """
+    headers = _tts_cache_headers(word)
+    if if_none_match and headers["ETag"] in [t.strip() for t in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    
     try:
-        audio_path = tts_service.get_audio_path(word)
+        audio_path = await asyncio.to_thread(tts_service.get_audio_path, word)
         
         if audio_path is None or not audio_path.exists():
             raise HTTPException(
@@ -104,7 +123,8 @@ async def get_tts(word: str):
         return FileResponse(
             path=str(audio_path),
             media_type="audio/mpeg",
-            filename=f"{word}.mp3"
+            filename=f"{word}.mp3",
+            headers=headers
         )
         
     except Exception as e:
@@ -9,18 +9,28 @@ from app.models.schemas import (
     UserStatsResponse, 
     UpdateStatsRequest, 
     UpdateStatsResponse,
-    UserCreateRequest
+    UserCreateRequest,
+    LogSessionRequest
 )
 from app.database import (
     get_or_create_user, 
     get_user, 
-    update_user_stats,
-    update_best_score,
-    log_practice_session
+    commit_session
 )
 
 router = APIRouter(prefix="/user", tags=["Users"])
 
+# Defaults for stats fields missing from older user documents
+_DEFAULT_STATS = {
+    "total_xp": 0,
+    "level": 1,
+    "streak": 0,
+    "pronunciation_sessions": 0,
+    "spelling_sessions": 0,
+    "best_pronunciation_score": 0,
+    "best_spelling_score": 0,
+}
+
 
 @router.post("/sync")
 async def sync_user(request: UserCreateRequest):
@@ -28,7 +38,7 @@ async def sync_user(request: UserCreateRequest):
     Sync or create a user from Firebase Auth.
     Called after successful Firebase login.
     """
-    user = get_or_create_user(
+    user = await get_or_create_user(
         firebase_uid=request.firebase_uid,
         email=request.email,
         display_name=request.display_name
@@ -49,7 +59,7 @@ async def get_profile(x_firebase_uid: str = Header(..., description="Firebase UI
     Get user profile with stats and badges.
     Requires Firebase UID in header.
     """
-    user = get_user(x_firebase_uid)
+    user = await get_user(x_firebase_uid)
     
     if not user:
         raise HTTPException(
@@ -57,21 +67,15 @@ async def get_profile(x_firebase_uid: str = Header(..., description="Firebase UI
             detail="User not found. Please sync your account first."
         )
     
-    stats = user.get("stats", {})
+    # The response model keeps only its own fields, so stored keys outside
+    # the defaults (e.g. last_practice_date) aren't returned
+    stats = UserStatsResponse.model_construct(**{**_DEFAULT_STATS, **user.get("stats", {})})
     
     return {
         "id": user.get("id"),
         "email": user.get("email"),
         "display_name": user.get("display_name"),
-        "stats": {
-            "total_xp": stats.get("total_xp", 0),
-            "level": stats.get("level", 1),
-            "streak": stats.get("streak", 0),
-            "pronunciation_sessions": stats.get("pronunciation_sessions", 0),
-            "spelling_sessions": stats.get("spelling_sessions", 0),
-            "best_pronunciation_score": stats.get("best_pronunciation_score", 0),
-            "best_spelling_score": stats.get("best_spelling_score", 0),
-        },
+        "stats": stats,
         "badges": user.get("badges", [])
     }
 
@@ -82,7 +86,7 @@ async def get_stats(x_firebase_uid: str = Header(..., description="Firebase UID"
     Get user stats only.
     Requires Firebase UID in header.
     """
-    user = get_user(x_firebase_uid)
+    user = await get_user(x_firebase_uid)
     
     if not user:
         raise HTTPException(
@@ -90,17 +94,9 @@ async def get_stats(x_firebase_uid: str = Header(..., description="Firebase UID"
             detail="User not found"
         )
     
-    stats = user.get("stats", {})
-    
-    return UserStatsResponse(
-        total_xp=stats.get("total_xp", 0),
-        level=stats.get("level", 1),
-        streak=stats.get("streak", 0),
-        pronunciation_sessions=stats.get("pronunciation_sessions", 0),
-        spelling_sessions=stats.get("spelling_sessions", 0),
-        best_pronunciation_score=stats.get("best_pronunciation_score", 0),
-        best_spelling_score=stats.get("best_spelling_score", 0)
-    )
+    # Values come from our own documents, so skip re-validation; keys outside
+    # the model's fields are dropped
+    return UserStatsResponse.model_construct(**{**_DEFAULT_STATS, **user.get("stats", {})})
 
 
 @router.post("/stats", response_model=UpdateStatsResponse)
@@ -115,10 +111,10 @@ async def update_stats(
     - **xp_earned**: XP earned in this session (0-100)
     - **mode**: "pronunciation" or "spelling"
     """
-    result = update_user_stats(
+    result = await commit_session(
         firebase_uid=x_firebase_uid,
-        xp_earned=request.xp_earned,
-        mode=request.mode
+        mode=request.mode,
+        xp_earned=request.xp_earned
     )
     
     if "error" in result:
@@ -138,23 +134,22 @@ async def update_stats(
 
 @router.post("/log-session")
 async def log_session(
-    word: str,
-    mode: str,
-    score: int,
+    request: LogSessionRequest,
     x_firebase_uid: str = Header(..., description="Firebase UID")
 ):
     """
     Log a practice session and update best score if applicable.
-    """
-    # Update best score
-    update_best_score(x_firebase_uid, mode, score)
     
-    # Log the session
-    log_practice_session(
+    - **word**: The practiced word
+    - **mode**: "pronunciation" or "spelling"
+    - **score**: Session score (0-100)
+    """
+    # Update best score and log the session in one commit
+    await commit_session(
         firebase_uid=x_firebase_uid,
-        mode=mode,
-        word=word,
-        score=score
+        mode=request.mode,
+        word=request.word,
+        score=request.score
     )
     
     return {"message": "Session logged successfully"}
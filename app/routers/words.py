@@ -2,13 +2,21 @@
 Word router for fetching words based on mode and difficulty.
 """
 
+from datetime import date
+from functools import lru_cache
 from fastapi import APIRouter, HTTPException, Query
 from app.models.schemas import WordResponse
-from app.services.word_service import word_service
+from app.services.word_service import Difficulty, word_service
 
 router = APIRouter(prefix="/word", tags=["Words"])
 
 
+@lru_cache(maxsize=2)
+def _cached_daily_words(day: str) -> dict:
+    """Daily words response, computed once per day."""
+    return {"words": word_service.get_daily_words()}
+
+
 @router.get("/daily")
 async def get_daily_words():
     """
@@ -16,19 +24,13 @@ async def get_daily_words():
     Returns 2 easy, 2 medium, 1 hard word with meanings.
     Same words are returned for the entire day.
     """
-    words = word_service.get_daily_words()
-    return {"words": words}
+    return _cached_daily_words(date.today().isoformat())
 
 
 @router.get("/stats")
 async def word_stats():
     """Get word count statistics by difficulty."""
-    return {
-        "total_words": word_service.get_word_count(),
-        "easy": word_service.get_word_count("easy"),
-        "medium": word_service.get_word_count("medium"),
-        "hard": word_service.get_word_count("hard")
-    }
+    return word_service.get_word_stats()
 
 
 @router.get("/{mode}/{difficulty}", response_model=WordResponse)
@@ -50,13 +52,14 @@ async def get_word(
         )
     
     # Validate difficulty
-    if difficulty.lower() not in ["easy", "medium", "hard"]:
+    level = Difficulty.parse(difficulty)
+    if level is None:
         raise HTTPException(
             status_code=400,
             detail="Difficulty must be 'easy', 'medium', or 'hard'"
         )
     
-    word = word_service.get_random_word(difficulty=difficulty, mode=mode)
+    word = word_service.get_random_word(difficulty=level, mode=mode)
     
     if not word:
         raise HTTPException(
@@ -64,14 +67,8 @@ async def get_word(
             detail=f"No words found for difficulty: {difficulty}"
         )
     
-    return WordResponse(
-        word=word["word"],
-        pos=word["pos"],
-        difficulty=word["difficulty"],
-        definition=word["definition"],
-        examples=word["examples"],
-        synonyms=word["synonyms"]
-    )
+    # Already in WordResponse shape; response_model validates it once
+    return word
 
 
 @router.get("/count")
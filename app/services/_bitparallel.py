@@ -0,0 +1,75 @@
+"""
+Bit-parallel Levenshtein distance (Myers 1999, Hyyrö 2001).
+
+One Python int holds a whole DP column as bit-vectors, so each character of
+the longer string costs a handful of bitwise operations instead of a loop
+over the other string. Python ints are arbitrary precision, so the same
+routine covers strings longer than 64 characters.
+"""
+
+from typing import Optional
+
+
+def levenshtein(a: str, b: str, score_cutoff: Optional[int] = None) -> int:
+    """
+    Return the Levenshtein distance between two strings.
+    
+    Like rapidfuzz, a distance above score_cutoff is returned as score_cutoff + 1.
+    """
+    # Common prefix and suffix never change the distance; find them by offset
+    # and slice once, so typo-sized differences leave only a few characters
+    start = 0
+    end_a = len(a)
+    end_b = len(b)
+    while start < end_a and start < end_b and a[start] == b[start]:
+        start += 1
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    if start or end_a < len(a) or end_b < len(b):
+        a = a[start:end_a]
+        b = b[start:end_b]
+    
+    # The distance is at least the length difference
+    if score_cutoff is not None and abs(len(a) - len(b)) > score_cutoff:
+        return score_cutoff + 1
+    
+    # Encode the shorter string as the bit pattern
+    if len(a) < len(b):
+        a, b = b, a
+    
+    m = len(b)
+    if m == 0:
+        return len(a)
+    
+    # Bitmask of positions in b for every character
+    peq: dict = {}
+    for i, char in enumerate(b):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    vp = mask
+    vn = 0
+    score = m
+    
+    for char in a:
+        eq = peq.get(char, 0)
+        xv = eq | vn
+        xh = (((eq & vp) + vp) ^ vp) | eq
+        hp = (vn | ~(xh | vp)) & mask
+        hn = vp & xh
+        
+        if hp & last:
+            score += 1
+        elif hn & last:
+            score -= 1
+        
+        hp = ((hp << 1) | 1) & mask
+        hn = (hn << 1) & mask
+        vp = (hn | ~(xv | hp)) & mask
+        vn = hp & xv
+    
+    if score_cutoff is not None and score > score_cutoff:
+        return score_cutoff + 1
+    return score
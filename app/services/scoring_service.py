@@ -3,28 +3,166 @@ Scoring service for pronunciation and spelling evaluation.
 Uses phonemizer for phoneme conversion and Levenshtein distance for scoring.
 """
 
-from phonemizer import phonemize
 from phonemizer.backend import EspeakBackend
-from Levenshtein import distance as levenshtein_distance
+from phonemizer.separator import Separator
+from collections import OrderedDict
+from typing import List, Optional
+import asyncio
+import logging
+import math
+import os
 import re
 
+try:
+    # rapidfuzz's C++ edit distance is SIMD/bit-parallel and much faster on short strings
+    from rapidfuzz.distance.Levenshtein import distance as levenshtein_distance
+except ImportError:
+    from app.services._bitparallel import levenshtein as levenshtein_distance
+
+logger = logging.getLogger(__name__)
+
+# Same output format as phonemize()'s default: no phone/syllable marks, words split by spaces
+PHONEME_SEPARATOR = Separator(phone="", syllable="", word=" ")
+
+# Deletes ASCII characters that r'[^\w\s]' would strip (everything but letters,
+# digits, underscore and whitespace)
+_ASCII_PUNCTUATION = str.maketrans("", "", "".join(
+    chr(c) for c in range(128)
+    if not (chr(c).isalnum() or chr(c).isspace() or chr(c) == "_")
+))
+
+# Batches smaller than this are phonemized in-process; bigger ones use all cores
+PARALLEL_MIN_TEXTS = 256
+
+# Maximum number of phonemized request texts (recognized speech etc.) kept in memory
+PHONEME_CACHE_MAX_SIZE = 8192
+
 
 class ScoringService:
     """Service for scoring pronunciation and spelling."""
     
     def __init__(self):
         self._backend = None
+        # Phonemes precomputed for the word dataset: cleaned text -> phonemes
+        self._phoneme_cache: dict = {}
+        # Least recently used phonemes of other texts seen in requests
+        self._recent_phonemes: OrderedDict = OrderedDict()
+        self._precompute_task: Optional[asyncio.Task] = None
+    
+    @staticmethod
+    def _create_backend() -> EspeakBackend:
+        """Create an espeak backend (each instance loads its own copy of libespeak)."""
+        return EspeakBackend(
+            language="en-us",
+            preserve_punctuation=False,
+            with_stress=False
+        )
     
     def _get_backend(self):
         """Get or create the espeak backend."""
         if self._backend is None:
-            self._backend = EspeakBackend(
-                language="en-us",
-                preserve_punctuation=False,
-                with_stress=False
-            )
+            self._backend = self._create_backend()
         return self._backend
     
+    @staticmethod
+    def _clean_text(text: str) -> str:
+        """Lowercase and strip punctuation before phonemizing."""
+        text = text.lower().strip()
+        if text.isascii():
+            return text.translate(_ASCII_PUNCTUATION)
+        return re.sub(r'[^\w\s]', '', text)
+    
+    def _phonemize(self, texts: List[str], backend: EspeakBackend = None) -> List[str]:
+        """Run espeak over cleaned texts in one call; large batches use all cores."""
+        if backend is None:
+            backend = self._get_backend()
+        njobs = 1 if len(texts) < PARALLEL_MIN_TEXTS else (os.cpu_count() or 1)
+        phonemes = backend.phonemize(
+            texts,
+            separator=PHONEME_SEPARATOR,
+            strip=True,
+            njobs=njobs
+        )
+        return [p.strip() for p in phonemes]
+    
+    def _cached_phonemes(self, text: str) -> Optional[str]:
+        """Look up phonemes of a cleaned text in the precomputed or recent caches."""
+        phonemes = self._phoneme_cache.get(text)
+        if phonemes is None:
+            phonemes = self._recent_phonemes.get(text)
+            if phonemes is not None:
+                self._recent_phonemes.move_to_end(text)
+        return phonemes
+    
+    def _remember_phonemes(self, phonemes: dict):
+        """Add freshly computed phonemes to the recent cache, evicting the oldest."""
+        self._recent_phonemes.update(phonemes)
+        while len(self._recent_phonemes) > PHONEME_CACHE_MAX_SIZE:
+            self._recent_phonemes.popitem(last=False)
+    
+    def text_to_phonemes_batch(self, texts: List[str]) -> List[str]:
+        """
+        Convert several texts to phonemes with a single espeak run.
+        
+        Args:
+            texts: Input texts
+            
+        Returns:
+            Phoneme strings, in the same order as texts
+        """
+        cleaned = [self._clean_text(text) if text else "" for text in texts]
+        known = {}
+        for text in cleaned:
+            if text and text not in known:
+                phonemes = self._cached_phonemes(text)
+                if phonemes is not None:
+                    known[text] = phonemes
+        pending = list(dict.fromkeys(
+            text for text in cleaned if text and text not in known
+        ))
+        
+        if pending:
+            try:
+                computed = dict(zip(pending, self._phonemize(pending)))
+                self._remember_phonemes(computed)
+            except Exception as e:
+                logger.warning("Error converting to phonemes: %s", e)
+                computed = {text: text for text in pending}
+            known.update(computed)
+        
+        return [known.get(text, text) for text in cleaned]
+    
+    def precompute_phonemes(self, texts: List[str]):
+        """
+        Phonemize a batch of texts (e.g. the whole word list) in one espeak run
+        spread over all CPU cores, and cache the results for text_to_phonemes.
+        
+        Args:
+            texts: Texts to phonemize
+        """
+        cleaned = {self._clean_text(text) for text in texts if text}
+        pending = [text for text in cleaned if text and text not in self._phoneme_cache]
+        if not pending:
+            return
+        
+        try:
+            # Runs in a background thread, so use a separate backend from requests
+            phonemes = self._phonemize(pending, backend=self._create_backend())
+        except Exception as e:
+            logger.warning("Error precomputing phonemes: %s", e)
+            return
+        
+        self._phoneme_cache.update(zip(pending, phonemes))
+        logger.info("Precomputed phonemes for %d words", len(pending))
+    
+    def start_precomputing(self, texts: List[str]) -> asyncio.Task:
+        """Run precompute_phonemes in a background thread without blocking startup."""
+        if self._precompute_task is None:
+            self._precompute_task = asyncio.create_task(
+                asyncio.to_thread(self.precompute_phonemes, texts)
+            )
+        return self._precompute_task
+    
     def text_to_phonemes(self, text: str) -> str:
         """
         Convert text to phoneme representation.
@@ -39,22 +177,20 @@ class ScoringService:
             return ""
         
         # Clean the text
-        text = text.lower().strip()
-        text = re.sub(r'[^\w\s]', '', text)
+        text = self._clean_text(text)
+        
+        cached = self._cached_phonemes(text)
+        if cached is not None:
+            return cached
         
         try:
-            phonemes = phonemize(
-                text,
-                language="en-us",
-                backend="espeak",
-                strip=True,
-                preserve_punctuation=False,
-                with_stress=False
-            )
-            return phonemes.strip()
+            phonemes = self._phonemize([text])[0]
         except Exception as e:
-            print(f"Error converting to phonemes: {e}")
+            logger.warning("Error converting to phonemes: %s", e)
             return text
+        
+        self._remember_phonemes({text: phonemes})
+        return phonemes
     
     def calculate_pronunciation_score(
         self, 
@@ -71,9 +207,11 @@ class ScoringService:
         Returns:
             Dict with score and feedback
         """
-        # Get phonemes
-        target_phonemes = self.text_to_phonemes(target_word)
-        recognized_phonemes = self.text_to_phonemes(recognized_text)
+        # Get phonemes for both texts; dataset words come from the precomputed
+        # cache, anything else shares one espeak run
+        target_phonemes, recognized_phonemes = self.text_to_phonemes_batch(
+            [target_word, recognized_text]
+        )
         
         # Calculate Levenshtein distance
         if not target_phonemes:
@@ -127,10 +265,13 @@ class ScoringService:
                 "feedback": "Perfect! You spelled it correctly!"
             }
         
-        # Calculate Levenshtein distance
-        dist = levenshtein_distance(target_word, user_text)
         max_len = max(len(target_word), len(user_text), 1)
         
+        # Calculate Levenshtein distance, stopping early once it can only score
+        # 0 (a length difference past the cutoff skips the DP entirely)
+        cutoff = max_len - math.ceil(max_len / 100)
+        dist = levenshtein_distance(target_word, user_text, score_cutoff=cutoff)
+        
         # Convert to 0-100 score
         similarity = 1 - (dist / max_len)
         score = max(0, min(100, int(similarity * 100)))
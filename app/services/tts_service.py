@@ -3,19 +3,44 @@ TTS service for text-to-speech using gTTS (Google Text-to-Speech).
 Generates audio files for words in the spelling game.
 """
 
+import asyncio
 import hashlib
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from gtts import gTTS
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+
+# Maximum number of word -> audio path entries kept in memory
+PATH_CACHE_MAX_SIZE = 4096
+
+# Maps every ASCII character that isn't a letter or digit to "_"
+_ASCII_UNSAFE = str.maketrans({
+    chr(c): "_" for c in range(128) if not chr(c).isalnum()
+})
+
+# Concurrent gTTS requests when precomputing audio
+PRECOMPUTE_WORKERS = 16
+
 
 class TTSService:
     """Service for text-to-speech using gTTS (Google Text-to-Speech)."""
     
     def __init__(self):
         self._loaded = True
+        self._precompute_task: Optional[asyncio.Task] = None
+        # Paths of audio files already generated: word -> Path
+        self._path_cache: dict = {}
+        # Guards _path_cache; request threads and the precompute pool share it
+        self._path_cache_lock = threading.Lock()
         self.language = "en"  # English
         self.tld = "com"  # Use .com for US accent
         # Alternative TLDs for different accents:
@@ -25,14 +50,23 @@ class TTSService:
     
     def load_model(self):
         """No model loading needed for gTTS."""
-        print("TTS service ready (using gTTS)")
+        logger.info("TTS service ready (using gTTS)")
         self._loaded = True
     
+    @staticmethod
+    def word_hash(word: str) -> str:
+        """Short, case-insensitive hash identifying a word's audio."""
+        return hashlib.blake2b(word.lower().encode(), digest_size=6).hexdigest()
+    
     def _get_cache_path(self, word: str) -> Path:
         """Get the cache file path for a word."""
         # Create a hash of the word for the filename
-        word_hash = hashlib.md5(word.lower().encode()).hexdigest()[:12]
-        safe_word = "".join(c if c.isalnum() else "_" for c in word.lower())[:20]
+        word_hash = self.word_hash(word)
+        safe_word = word.lower()[:20]
+        if safe_word.isascii():
+            safe_word = safe_word.translate(_ASCII_UNSAFE)
+        else:
+            safe_word = "".join(c if c.isalnum() else "_" for c in safe_word)
         filename = f"{safe_word}_{word_hash}.mp3"
         return settings.AUDIO_CACHE_DIR / filename
     
@@ -61,23 +95,31 @@ class TTSService:
             except:
                 pass
         
+        temp_path = None
         try:
-            # Generate speech using gTTS
+            # Generate speech using gTTS into a temp file, then rename it into
+            # place so concurrent readers never see a partially written file
             tts = gTTS(text=word, lang=self.language, tld=self.tld, slow=False)
-            tts.save(str(cache_path))
+            with tempfile.NamedTemporaryFile(
+                dir=cache_path.parent, suffix=".tmp", delete=False
+            ) as f:
+                temp_path = f.name
+                tts.write_to_fp(f)
             
             # Verify file was created and is not empty
-            if cache_path.exists() and cache_path.stat().st_size > 0:
+            if os.path.getsize(temp_path) > 0:
+                os.replace(temp_path, cache_path)
                 return cache_path
             else:
+                os.remove(temp_path)
                 return None
                 
         except Exception as e:
-            print(f"gTTS error for '{word}': {e}")
+            logger.warning("gTTS error for '%s': %s", word, e)
             # Clean up any partial file
-            if cache_path.exists():
+            if temp_path is not None and os.path.exists(temp_path):
                 try:
-                    cache_path.unlink()
+                    os.remove(temp_path)
                 except:
                     pass
             return None
@@ -85,6 +127,8 @@ class TTSService:
     def get_audio_path(self, word: str) -> Optional[Path]:
         """
         Get the audio file path for a word, generating if needed.
+        Paths are remembered in memory so repeated words skip regenerating;
+        an entry whose file has since been deleted is dropped and regenerated.
         
         Args:
             word: The word to get audio for
@@ -92,19 +136,57 @@ class TTSService:
         Returns:
             Path to the audio file, or None if generation fails
         """
+        with self._path_cache_lock:
+            path = self._path_cache.get(word)
+        if path is not None:
+            if path.exists():
+                return path
+            with self._path_cache_lock:
+                self._path_cache.pop(word, None)
+        
         try:
-            return self.generate_audio(word)
+            path = self.generate_audio(word)
         except Exception as e:
-            print(f"Error generating audio for '{word}': {e}")
+            logger.warning("Error generating audio for '%s': %s", word, e)
             return None
+        
+        if path is not None:
+            with self._path_cache_lock:
+                if len(self._path_cache) >= PATH_CACHE_MAX_SIZE:
+                    # Evict the oldest entry
+                    self._path_cache.pop(next(iter(self._path_cache)), None)
+                self._path_cache[word] = path
+        return path
+    
+    def precompute_audio(self, words: List[str]):
+        """Generate audio for words that aren't cached yet, several at a time."""
+        pending = [w for w in dict.fromkeys(words) if w]
+        if not pending:
+            return
+        
+        with ThreadPoolExecutor(max_workers=PRECOMPUTE_WORKERS) as pool:
+            paths = list(pool.map(self.get_audio_path, pending))
+        
+        ready = sum(1 for path in paths if path is not None)
+        logger.info("Precomputed audio for %d/%d words", ready, len(pending))
+    
+    def start_precomputing(self, words: List[str]) -> asyncio.Task:
+        """Run precompute_audio in a background thread without blocking startup."""
+        if self._precompute_task is None:
+            self._precompute_task = asyncio.create_task(
+                asyncio.to_thread(self.precompute_audio, words)
+            )
+        return self._precompute_task
     
     def clear_cache(self):
         """Clear all cached audio files."""
+        with self._path_cache_lock:
+            self._path_cache.clear()
         for file in settings.AUDIO_CACHE_DIR.glob("*.mp3"):
             try:
                 file.unlink()
             except Exception as e:
-                print(f"Error deleting {file}: {e}")
+                logger.warning("Error deleting %s: %s", file, e)
 
 
 # Singleton instance
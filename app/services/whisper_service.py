@@ -3,21 +3,30 @@ Whisper service for speech-to-text transcription.
 Uses Faster Whisper for optimized CPU inference.
 """
 
-from faster_whisper import WhisperModel
-import tempfile
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+import asyncio
+import logging
+import io
 import os
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional, Union
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Number of VAD chunks decoded together by the batched pipeline
+TRANSCRIBE_BATCH_SIZE = 8
+
 
 class WhisperService:
     """Service for speech-to-text using Faster Whisper."""
     
     def __init__(self):
         self.model = None
+        self.pipeline = None
         self._loaded = False
+        self._load_task: Optional[asyncio.Task] = None
     
     def load_model(self):
         """Load the Faster Whisper model into memory."""
@@ -25,29 +34,54 @@ class WhisperService:
             return
         
         model_size = settings.WHISPER_MODEL
-        print(f"Loading Faster Whisper model: {model_size}")
+        logger.info("Loading Faster Whisper model: %s", model_size)
         
         # Download to models directory
         download_root = str(settings.MODELS_DIR / "whisper")
         os.makedirs(download_root, exist_ok=True)
         
-        # Use CPU with int8 quantization for efficiency
+        # Use CPU with int8 quantization for efficiency, on every core
         self.model = WhisperModel(
             model_size,
             device="cpu",
             compute_type="int8",
+            cpu_threads=os.cpu_count() or 0,
+            num_workers=2,
             download_root=download_root
         )
+        # Decode speech chunks in batches instead of one window at a time
+        self.pipeline = BatchedInferencePipeline(self.model)
         
         self._loaded = True
-        print("Faster Whisper model loaded successfully")
+        logger.info("Faster Whisper model loaded successfully")
+    
+    def start_loading(self) -> asyncio.Task:
+        """
+        Load the model in a background thread without blocking startup.
+        A load that failed is started again on the next call.
+        """
+        if self._load_task is None or (self._load_task.done() and not self._loaded):
+            self._load_task = asyncio.create_task(asyncio.to_thread(self.load_model))
+        return self._load_task
+    
+    async def wait_until_loaded(self):
+        """
+        Wait until the model is loaded, retrying a failed load in the background.
+        
+        Raises:
+            Exception: The error that stopped the model from loading
+        """
+        if self._loaded:
+            return
+        # Shielded, so a cancelled request doesn't cancel the shared load
+        await asyncio.shield(self.start_loading())
     
-    def transcribe(self, audio_path: str) -> str:
+    def transcribe(self, audio_path: Union[str, BinaryIO]) -> str:
         """
         Transcribe audio file to text.
         
         Args:
-            audio_path: Path to the audio file
+            audio_path: Path to the audio file, or a binary file object
             
         Returns:
             Transcribed text
@@ -56,10 +90,11 @@ class WhisperService:
             self.load_model()
         
         # Transcribe with Faster Whisper
-        segments, info = self.model.transcribe(
+        segments, info = self.pipeline.transcribe(
             audio_path,
             language="en",
             beam_size=5,
+            batch_size=TRANSCRIBE_BATCH_SIZE,
             vad_filter=True,  # Filter out silence
         )
         
@@ -67,28 +102,33 @@ class WhisperService:
         text = " ".join([segment.text for segment in segments]).strip()
         return text
     
-    def transcribe_bytes(self, audio_bytes: bytes, suffix: str = ".webm") -> str:
+    def transcribe_file(self, audio_file: BinaryIO) -> str:
+        """
+        Transcribe audio from an open binary file (e.g. an upload's spooled file).
+        The audio is decoded straight from the file object, without a temp copy.
+        
+        Args:
+            audio_file: Binary file object containing the audio
+            
+        Returns:
+            Transcribed text
+        """
+        audio_file.seek(0)
+        return self.transcribe(audio_file)
+    
+    def transcribe_bytes(self, audio_bytes: bytes) -> str:
         """
         Transcribe audio from bytes.
+        The bytes are decoded in-process by faster-whisper (PyAV) from memory,
+        which probes the container format from the data itself.
         
         Args:
             audio_bytes: Raw audio bytes
-            suffix: File suffix for the temp file
             
         Returns:
             Transcribed text
         """
-        # Write to temporary file
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
-            f.write(audio_bytes)
-            temp_path = f.name
-        
-        try:
-            return self.transcribe(temp_path)
-        finally:
-            # Clean up temp file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+        return self.transcribe(io.BytesIO(audio_bytes))
 
 
 # Singleton instance
@@ -2,27 +2,105 @@
 Word service for loading and filtering the WordNet-derived dataset.
 """
 
-import json
-import random
+import logging
+import mmap
+import os
+import pickle
+import sys
+import tempfile
 from datetime import date
+from enum import IntEnum
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Sequence, Union
+import numpy as np
+import orjson
 from app.config import settings
 
+try:
+    # Optional: lets the dataset ship as a zstd-compressed words.json.zst
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+class Difficulty(IntEnum):
+    """Difficulty level; the value is its position in DIFFICULTIES."""
+    EASY = 0
+    MEDIUM = 1
+    HARD = 2
+    
+    @classmethod
+    def parse(cls, label: str) -> Optional["Difficulty"]:
+        """Map a difficulty label (any case) to a Difficulty, or None if unknown."""
+        difficulty = _DIFFICULTY_LABELS.get(label)
+        if difficulty is None:
+            difficulty = _DIFFICULTY_LABELS.get(label.lower())
+        return difficulty
+
+
+# Common spellings resolve with one dict lookup; anything else is lowercased first
+_DIFFICULTY_LABELS = {
+    spelling: Difficulty(code)
+    for code, label in enumerate(DIFFICULTIES)
+    for spelling in (label, label.capitalize(), label.upper())
+}
+
+# Bump when the snapshot layout changes so old snapshots are ignored
+SNAPSHOT_VERSION = 2
+
+# Random picks drawn per numpy call; one vectorized draw is far cheaper than
+# a Python-level RNG call per request
+RANDOM_BATCH_SIZE = 1024
+
+# Small built-in dataset used when no words file is found
+_SAMPLE_WORDS = (
+    {"word": "cat", "pos": "n", "difficulty": "Easy", "definitions": ["a small domesticated carnivorous mammal"], "examples": ["The cat sat on the mat"], "synonyms": ["feline", "kitty"]},
+    {"word": "dog", "pos": "n", "difficulty": "Easy", "definitions": ["a domesticated carnivorous mammal"], "examples": ["The dog barked loudly"], "synonyms": ["canine", "hound"]},
+    {"word": "happy", "pos": "a", "difficulty": "Easy", "definitions": ["feeling or showing pleasure"], "examples": ["She was happy to see him"], "synonyms": ["joyful", "cheerful"]},
+    {"word": "beautiful", "pos": "a", "difficulty": "Medium", "definitions": ["pleasing the senses or mind aesthetically"], "examples": ["A beautiful sunset"], "synonyms": ["gorgeous", "stunning"]},
+    {"word": "eloquent", "pos": "a", "difficulty": "Hard", "definitions": ["fluent or persuasive in speaking or writing"], "examples": ["An eloquent speaker"], "synonyms": ["articulate", "expressive"]},
+    {"word": "ephemeral", "pos": "a", "difficulty": "Hard", "definitions": ["lasting for a very short time"], "examples": ["Ephemeral pleasures"], "synonyms": ["transient", "fleeting"]},
+    {"word": "ubiquitous", "pos": "a", "difficulty": "Hard", "definitions": ["present, appearing, or found everywhere"], "examples": ["Smartphones are now ubiquitous"], "synonyms": ["omnipresent", "pervasive"]},
+    {"word": "run", "pos": "v", "difficulty": "Easy", "definitions": ["move at a speed faster than a walk"], "examples": ["He ran to catch the bus"], "synonyms": ["sprint", "dash"]},
+    {"word": "comprehend", "pos": "v", "difficulty": "Medium", "definitions": ["grasp mentally; understand"], "examples": ["I cannot comprehend his motives"], "synonyms": ["understand", "grasp"]},
+    {"word": "ameliorate", "pos": "v", "difficulty": "Hard", "definitions": ["make something bad or unsatisfactory better"], "examples": ["Steps to ameliorate the situation"], "synonyms": ["improve", "enhance"]},
+)
+
+
+def _intern(value):
+    """sys.intern strings and pass anything else through unchanged."""
+    return sys.intern(value) if isinstance(value, str) else value
+
 
 class WordService:
     """Service for managing the word dataset."""
     
     def __init__(self):
-        self.words: List[dict] = []
+        # The dataset as parallel columns, one entry per word
+        self.word_texts: List[str] = []
+        self._pos: List[str] = []
+        self._difficulties: List[str] = []
+        self._definitions: List[str] = []
+        self._examples: List[list] = []
+        self._synonyms: List[list] = []
+        # Indices into the columns for each difficulty
         self.words_by_difficulty: dict = {
-            "easy": [],
-            "medium": [],
-            "hard": [],
+            diff: np.empty(0, dtype=np.int32) for diff in DIFFICULTIES
         }
+        # The same arrays, indexed by Difficulty
+        self._buckets: tuple = tuple(self.words_by_difficulty.values())
+        # Word counts for /word/stats, fixed once the dataset is indexed
+        self._word_stats: dict = {"total_words": 0, **{diff: 0 for diff in DIFFICULTIES}}
         self._loaded = False
         # Daily word cache: { "date": date_obj, "words": [...] }
         self._daily_cache: dict = {"date": None, "words": []}
+        # Pre-drawn random word positions: Difficulty (None for any) -> list
+        self._rng = np.random.default_rng()
+        self._random_picks: dict = {}
     
     def load_words(self, words_file: Path = None):
         """Load words from JSON file and index by difficulty."""
@@ -31,89 +109,238 @@ class WordService:
         
         if words_file is None:
             words_file = settings.DATA_DIR / "words.json"
+        words_file = self._prefer_compressed(words_file)
         
         # Also check for wordnet_full.json
         if not words_file.exists():
-            words_file = settings.BASE_DIR.parent / "wordnet_full.json"
+            words_file = self._prefer_compressed(settings.BASE_DIR.parent / "wordnet_full.json")
         
         if not words_file.exists():
-            print(f"Warning: Words file not found at {words_file}")
+            logger.warning("Words file not found at %s", words_file)
             # Create some sample words for testing
             self._create_sample_words()
             self._loaded = True
             return
         
-        with open(words_file, "r", encoding="utf-8") as f:
-            self.words = json.load(f)
-        
-        # Index words by difficulty
-        for word in self.words:
-            difficulty = word.get("difficulty", "Medium").lower()
-            if difficulty in self.words_by_difficulty:
-                self.words_by_difficulty[difficulty].append(word)
+        if not self._load_snapshot(words_file):
+            records = self._parse_words_file(words_file)
+            
+            self._store_columns(records)
+            del records
+            self._index_words()
+            self._save_snapshot(words_file)
         
-        print(f"Loaded {len(self.words)} words:")
-        for diff, words in self.words_by_difficulty.items():
-            print(f"  {diff}: {len(words)} words")
+        logger.info("Loaded %d words", len(self.word_texts))
+        for diff, indices in self.words_by_difficulty.items():
+            logger.info("  %s: %d words", diff, indices.size)
         
         self._loaded = True
     
+    @staticmethod
+    def _prefer_compressed(words_file: Path) -> Path:
+        """Use words_file's .zst sibling instead when it exists and zstandard is installed."""
+        compressed = words_file.with_name(words_file.name + ".zst")
+        if zstandard is not None and compressed.exists():
+            return compressed
+        return words_file
+    
+    @staticmethod
+    def _parse_words_file(words_file: Path) -> list:
+        """Parse a JSON words file, decompressing it first if it is .zst."""
+        if words_file.suffix == ".zst":
+            with open(words_file, "rb") as f:
+                with zstandard.ZstdDecompressor().stream_reader(f) as reader:
+                    return orjson.loads(reader.read())
+        
+        # Parse straight from the mapped file, without reading it into a str first
+        with open(words_file, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+    
+    @staticmethod
+    def _snapshot_path(words_file: Path) -> Path:
+        """Path of the pickled copy of a parsed and indexed words file."""
+        return settings.DATA_DIR / f"{words_file.stem}.pkl"
+    
+    @staticmethod
+    def _snapshot_signature(words_file: Path) -> tuple:
+        """Identify a version of the words file; any edit invalidates its snapshot."""
+        stat = words_file.stat()
+        return (SNAPSHOT_VERSION, str(words_file.resolve()), stat.st_mtime_ns, stat.st_size)
+    
+    def _load_snapshot(self, words_file: Path) -> bool:
+        """Restore words and indexes from the snapshot, if it matches words_file."""
+        snapshot_path = self._snapshot_path(words_file)
+        try:
+            signature, columns, words_by_difficulty, word_stats = pickle.loads(
+                snapshot_path.read_bytes()
+            )
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning("Ignoring unreadable words snapshot %s: %s", snapshot_path, e)
+            return False
+        
+        if signature != self._snapshot_signature(words_file):
+            return False
+        
+        (
+            self.word_texts,
+            self._pos,
+            self._difficulties,
+            self._definitions,
+            self._examples,
+            self._synonyms,
+        ) = columns
+        self.words_by_difficulty = words_by_difficulty
+        self._buckets = tuple(words_by_difficulty[diff] for diff in DIFFICULTIES)
+        self._word_stats = word_stats
+        return True
+    
+    def _save_snapshot(self, words_file: Path):
+        """Pickle the parsed words and indexes so the next start skips parsing."""
+        snapshot_path = self._snapshot_path(words_file)
+        snapshot = (
+            self._snapshot_signature(words_file),
+            (
+                self.word_texts,
+                self._pos,
+                self._difficulties,
+                self._definitions,
+                self._examples,
+                self._synonyms,
+            ),
+            self.words_by_difficulty,
+            self._word_stats,
+        )
+        temp_path = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                dir=snapshot_path.parent, suffix=".tmp", delete=False
+            ) as f:
+                temp_path = f.name
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, snapshot_path)
+        except Exception as e:
+            logger.warning("Could not write words snapshot %s: %s", snapshot_path, e)
+            # Clean up any partial file
+            if temp_path is not None and os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+    
     def _create_sample_words(self):
         """Create sample words for testing if dataset is missing."""
-        sample_words = [
-            {"word": "cat", "pos": "n", "difficulty": "Easy", "definitions": ["a small domesticated carnivorous mammal"], "examples": ["The cat sat on the mat"], "synonyms": ["feline", "kitty"]},
-            {"word": "dog", "pos": "n", "difficulty": "Easy", "definitions": ["a domesticated carnivorous mammal"], "examples": ["The dog barked loudly"], "synonyms": ["canine", "hound"]},
-            {"word": "happy", "pos": "a", "difficulty": "Easy", "definitions": ["feeling or showing pleasure"], "examples": ["She was happy to see him"], "synonyms": ["joyful", "cheerful"]},
-            {"word": "beautiful", "pos": "a", "difficulty": "Medium", "definitions": ["pleasing the senses or mind aesthetically"], "examples": ["A beautiful sunset"], "synonyms": ["gorgeous", "stunning"]},
-            {"word": "eloquent", "pos": "a", "difficulty": "Hard", "definitions": ["fluent or persuasive in speaking or writing"], "examples": ["An eloquent speaker"], "synonyms": ["articulate", "expressive"]},
-            {"word": "ephemeral", "pos": "a", "difficulty": "Hard", "definitions": ["lasting for a very short time"], "examples": ["Ephemeral pleasures"], "synonyms": ["transient", "fleeting"]},
-            {"word": "ubiquitous", "pos": "a", "difficulty": "Hard", "definitions": ["present, appearing, or found everywhere"], "examples": ["Smartphones are now ubiquitous"], "synonyms": ["omnipresent", "pervasive"]},
-            {"word": "run", "pos": "v", "difficulty": "Easy", "definitions": ["move at a speed faster than a walk"], "examples": ["He ran to catch the bus"], "synonyms": ["sprint", "dash"]},
-            {"word": "comprehend", "pos": "v", "difficulty": "Medium", "definitions": ["grasp mentally; understand"], "examples": ["I cannot comprehend his motives"], "synonyms": ["understand", "grasp"]},
-            {"word": "ameliorate", "pos": "v", "difficulty": "Hard", "definitions": ["make something bad or unsatisfactory better"], "examples": ["Steps to ameliorate the situation"], "synonyms": ["improve", "enhance"]},
+        self._store_columns(_SAMPLE_WORDS)
+        self._index_words()
+    
+    def _store_columns(self, records: Sequence[dict]):
+        """
+        Split word records into the parallel columns, keeping only the fields
+        that are served. Repeated pos, difficulty and synonym strings are
+        interned so every word shares one object per distinct value.
+        """
+        self.word_texts = [record.get("word", "") for record in records]
+        self._pos = [_intern(record.get("pos", "")) for record in records]
+        self._difficulties = [_intern(record.get("difficulty", "Medium")) for record in records]
+        self._definitions = [
+            record["definitions"][0] if record.get("definitions") else ""
+            for record in records
         ]
+        self._examples = [record.get("examples", []) for record in records]
+        self._synonyms = [
+            [_intern(s) for s in synonyms] if isinstance(synonyms, list) else synonyms
+            for synonyms in (record.get("synonyms", []) for record in records)
+        ]
+    
+    def _index_words(self):
+        """Index words by difficulty as arrays of positions in the columns."""
+        # Encode each word's difficulty as a small int; the labels are interned
+        # and few, so each distinct label is lowercased only once
+        codes_by_label = {}
+        for label in set(self._difficulties):
+            difficulty = label.lower()
+            codes_by_label[label] = (
+                DIFFICULTIES.index(difficulty) if difficulty in DIFFICULTIES else len(DIFFICULTIES)
+            )
+        codes = np.fromiter(
+            map(codes_by_label.__getitem__, self._difficulties),
+            dtype=np.uint8,
+            count=len(self._difficulties),
+        )
         
-        self.words = sample_words
-        for word in sample_words:
-            difficulty = word.get("difficulty", "Medium").lower()
-            if difficulty in self.words_by_difficulty:
-                self.words_by_difficulty[difficulty].append(word)
+        self._buckets = tuple(
+            np.flatnonzero(codes == code).astype(np.int32) for code in Difficulty
+        )
+        self.words_by_difficulty = dict(zip(DIFFICULTIES, self._buckets))
+        self._word_stats = {
+            "total_words": len(self.word_texts),
+            **{diff: int(indices.size) for diff, indices in self.words_by_difficulty.items()},
+        }
     
-    def get_random_word(self, difficulty: str = None, mode: str = "pronunciation") -> Optional[dict]:
+    def get_random_word(
+        self,
+        difficulty: Union[Difficulty, str, None] = None,
+        mode: str = "pronunciation"
+    ) -> Optional[dict]:
         """Get a random word, optionally filtered by difficulty."""
         if not self._loaded:
             self.load_words()
         
-        if difficulty:
-            difficulty = difficulty.lower()
-            words = self.words_by_difficulty.get(difficulty, [])
-            if not words:
-                words = self.words
-        else:
-            words = self.words
-        
-        if not words:
+        if not self.word_texts:
             return None
         
-        word_data = random.choice(words)
+        if difficulty is not None and not isinstance(difficulty, Difficulty):
+            difficulty = Difficulty.parse(difficulty)
+        
+        key = None
+        if difficulty is not None and self._buckets[difficulty].size:
+            key = difficulty
+        
+        picks = self._random_picks.get(key)
+        if not picks:
+            picks = self._draw_random_picks(key)
+        i = picks.pop()
         
         return {
-            "word": word_data.get("word", ""),
-            "pos": word_data.get("pos", ""),
-            "difficulty": word_data.get("difficulty", "Medium"),
-            "definition": word_data.get("definitions", [""])[0] if word_data.get("definitions") else "",
-            "examples": word_data.get("examples", []),
-            "synonyms": word_data.get("synonyms", []),
+            "word": self.word_texts[i],
+            "pos": self._pos[i],
+            "difficulty": self._difficulties[i],
+            "definition": self._definitions[i],
+            "examples": self._examples[i],
+            "synonyms": self._synonyms[i],
         }
     
+    def _draw_random_picks(self, difficulty: Optional[Difficulty]) -> List[int]:
+        """Draw the next RANDOM_BATCH_SIZE random word positions for a difficulty."""
+        if difficulty is None:
+            picks = self._rng.integers(len(self.word_texts), size=RANDOM_BATCH_SIZE)
+        else:
+            indices = self._buckets[difficulty]
+            picks = indices[self._rng.integers(indices.size, size=RANDOM_BATCH_SIZE)]
+        
+        picks = picks.tolist()
+        self._random_picks[difficulty] = picks
+        return picks
+    
     def get_word_count(self, difficulty: str = None) -> int:
         """Get the count of words, optionally filtered by difficulty."""
         if not self._loaded:
             self.load_words()
         
         if difficulty:
-            return len(self.words_by_difficulty.get(difficulty.lower(), []))
-        return len(self.words)
+            indices = self.words_by_difficulty.get(difficulty.lower())
+            return int(indices.size) if indices is not None else 0
+        return len(self.word_texts)
+    
+    def get_word_stats(self) -> dict:
+        """Get the total word count and the count for each difficulty."""
+        if not self._loaded:
+            self.load_words()
+        
+        return self._word_stats
     
     def get_daily_words(self) -> List[dict]:
         """
@@ -131,41 +358,25 @@ class WordService:
         
         # Use date as seed for consistent daily selection
         seed = today.toordinal()
-        rng = random.Random(seed)
+        rng = np.random.default_rng(seed)
         
-        daily_words = []
+        daily_indices = []
         
-        # Select 2 easy words
-        easy_words = self.words_by_difficulty.get("easy", [])
-        if len(easy_words) >= 2:
-            selected_easy = rng.sample(easy_words, 2)
-        else:
-            selected_easy = easy_words[:2] if easy_words else []
-        daily_words.extend(selected_easy)
-        
-        # Select 2 medium words
-        medium_words = self.words_by_difficulty.get("medium", [])
-        if len(medium_words) >= 2:
-            selected_medium = rng.sample(medium_words, 2)
-        else:
-            selected_medium = medium_words[:2] if medium_words else []
-        daily_words.extend(selected_medium)
-        
-        # Select 1 hard word
-        hard_words = self.words_by_difficulty.get("hard", [])
-        if hard_words:
-            selected_hard = [rng.choice(hard_words)]
-        else:
-            selected_hard = []
-        daily_words.extend(selected_hard)
+        # Select 2 easy, 2 medium and 1 hard word
+        for difficulty, count in (("easy", 2), ("medium", 2), ("hard", 1)):
+            indices = self.words_by_difficulty[difficulty]
+            if indices.size > count:
+                daily_indices.extend(rng.choice(indices, size=count, replace=False))
+            else:
+                daily_indices.extend(indices[:count])
         
         # Format response with word and meaning
         formatted_words = []
-        for word_data in daily_words:
+        for i in daily_indices:
             formatted_words.append({
-                "word": word_data.get("word", ""),
-                "meaning": word_data.get("definitions", [""])[0] if word_data.get("definitions") else "",
-                "difficulty": word_data.get("difficulty", "Medium"),
+                "word": self.word_texts[i],
+                "meaning": self._definitions[i],
+                "difficulty": self._difficulties[i],
             })
         
         # Cache the result
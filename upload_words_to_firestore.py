@@ -4,15 +4,30 @@ Upload Words to Firestore
 This script uploads all words from wordnet_full.json to Firestore,
 organized by difficulty level for efficient querying.
 
-Run: python upload_words_to_firestore.py
+Each word and part of speech is one document (id <word>_<pos>) holding all
+of its senses. Documents left from earlier uploads, e.g. the old one-per-sense
+documents with ids <word>_<index>, stay in place unless --prune-stale is given.
+That deletes every document in the word collections that this upload didn't
+write, so check the count with --dry-run first.
+
+Run: python upload_words_to_firestore.py [--prune-stale] [--dry-run]
 """
 
+import argparse
 import json
-import time
+import sys
+from collections import Counter
 import firebase_admin
 from firebase_admin import credentials, firestore
+from google.api_core import exceptions, retry
+from google.cloud.firestore_v1.bulk_writer import BulkRetry, BulkWriterOptions
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Initialize Firebase Admin SDK
 cred_path = Path(__file__).parent / "firebase-credentials.json"
 if not firebase_admin._apps:
@@ -21,111 +36,214 @@ if not firebase_admin._apps:
 
 db = firestore.client()
 
-# Smaller batch size to avoid timeouts
-BATCH_SIZE = 200
+# BulkWriter batches, parallelizes and throttles writes itself; it starts at
+# 500 writes/s and ramps up by 50% every 5 minutes (Firestore's 500/50/5 rule)
+BULK_WRITER_OPTIONS = BulkWriterOptions(max_ops_per_second=10000, retry=BulkRetry.exponential)
+MAX_RETRIES = 3
+
+# Errors worth retrying: contention, timeouts, throttling and server-side failures
+is_retryable = retry.if_exception_type(
+    exceptions.Aborted,
+    exceptions.DeadlineExceeded,
+    exceptions.InternalServerError,
+    exceptions.ServiceUnavailable,
+    exceptions.TooManyRequests,
+)
+
+# Exponential backoff for single writes outside the BulkWriter
+WRITE_RETRY = retry.Retry(predicate=is_retryable, initial=0.5, maximum=30, multiplier=2)
+
+# Fields every word document has, with the value used when the source lacks one
+DOC_DEFAULTS = {
+    "word": "",
+    "pos": "",
+    "difficulty": "Medium",
+    "definitions": [],
+    "examples": [],
+    "synonyms": [],
+    "antonyms": [],
+}
+
+# Writes that still failed after their last retry, as (document path, gRPC error)
+failed_writes = []
+
+# List fields combined when several senses of a word are merged into one document
+SENSE_FIELDS = ("definitions", "examples", "synonyms", "antonyms")
+
+
+def load_json(path: Path):
+    """Parse a JSON file, with orjson when it is installed."""
+    data = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def merge_senses(records):
+    """
+    Merge every record for the same word and part of speech (WordNet lists
+    each sense separately) into one record with all of their definitions,
+    examples, synonyms and antonyms. The first record decides the difficulty.
+    
+    Senses of a word needn't be adjacent, so all words are grouped before
+    any is returned.
+    
+    Returns:
+        Merged records, in order of each word's first appearance
+    """
+    merged = {}
+    for record in records:
+        key = (record.get("word"), record.get("pos"))
+        current = merged.get(key)
+        if current is None:
+            # Fresh lists (empty for missing or null fields), so adding later
+            # senses never changes the parsed ones
+            for field in SENSE_FIELDS:
+                record[field] = list(record.get(field) or [])
+            merged[key] = record
+            continue
+        
+        for field in SENSE_FIELDS:
+            current[field].extend(record.get(field) or [])
+    
+    return merged.values()
+
+
+def retry_failed_write(failure, bulk_writer) -> bool:
+    """Retry a transiently failed write (with exponential backoff) up to MAX_RETRIES times."""
+    error = exceptions.from_grpc_status(failure.code, failure.message)
+    if failure.attempts < MAX_RETRIES and is_retryable(error):
+        print(f"  Retry {failure.attempts + 1}/{MAX_RETRIES}...")
+        return True
+    path = failure.operation.reference.path
+    failed_writes.append((path, error))
+    print(f"  Error writing {path} after {failure.attempts + 1} attempts: {failure.message}")
+    return False
+
+
+def find_stale_documents(doc_ids: dict) -> list:
+    """
+    Find documents that this upload didn't write, such as the per-sense
+    documents (ids <word>_<index>) of uploads before senses were merged.
+    Deleting them leaves each collection with one document per word and its
+    index values dense and unique.
+    
+    Args:
+        doc_ids: Difficulty -> ids of the documents written to its collection
+        
+    Returns:
+        References of the stale documents
+    """
+    stale = []
+    for difficulty, ids in doc_ids.items():
+        for doc_ref in db.collection(f"words_{difficulty}").list_documents():
+            if doc_ref.id not in ids:
+                stale.append(doc_ref)
+    return stale
+
+
+def delete_documents(doc_refs: list) -> int:
+    """
+    Delete documents with a writer of their own. A writer that has been
+    flushed or closed doesn't reliably send writes queued on it afterwards.
+    
+    Returns:
+        Number of deletes Firestore confirmed
+    """
+    confirmed = []
+    bulk_writer = db.bulk_writer(options=BULK_WRITER_OPTIONS)
+    bulk_writer.on_write_error(retry_failed_write)
+    bulk_writer.on_write_result(lambda doc_ref, result, writer: confirmed.append(doc_ref))
+    for doc_ref in doc_refs:
+        bulk_writer.delete(doc_ref)
+    bulk_writer.close()
+    return len(confirmed)
+
+
+def exit_if_writes_failed():
+    """Summarize the writes that failed after their retries and exit with status 1."""
+    if not failed_writes:
+        return
+    print(f"\n✗ Upload failed: {len(failed_writes)} writes failed after retries")
+    # A single cause (e.g. PermissionDenied for every write) shows up as one line
+    errors = Counter(type(error).__name__ for _, error in failed_writes)
+    for name, count in errors.most_common():
+        print(f"  {name}: {count}")
+    print("Word count metadata was not updated.")
+    sys.exit(1)
 
 
-def upload_words():
-    """Upload all words to Firestore organized by difficulty."""
+def upload_words(prune_stale: bool = False, dry_run: bool = False):
+    """
+    Upload all words to Firestore organized by difficulty.
+    
+    Args:
+        prune_stale: Delete documents in the word collections that this upload didn't write
+        dry_run: Write nothing; only report the counts, and the stale documents with prune_stale
+    """
     
     # Load words from JSON
     words_file = Path(__file__).parent.parent / "wordnet_full.json"
     if not words_file.exists():
         words_file = Path(__file__).parent / "data" / "words.json"
     
-    print(f"Loading words from {words_file}...")
-    with open(words_file, "r", encoding="utf-8") as f:
-        words = json.load(f)
-    
-    print(f"Loaded {len(words)} words")
-    
     # Count words by difficulty
     counts = {"easy": 0, "medium": 0, "hard": 0}
+    doc_ids = {difficulty: set() for difficulty in counts}
     
-    # Organize words by difficulty
-    words_by_difficulty = {"easy": [], "medium": [], "hard": []}
-    
-    for word in words:
-        difficulty = word.get("difficulty", "Medium").lower()
-        if difficulty in words_by_difficulty:
-            words_by_difficulty[difficulty].append(word)
-            counts[difficulty] += 1
-    
-    print(f"\nWord counts by difficulty:")
-    for diff, count in counts.items():
-        print(f"  {diff}: {count}")
+    # One writer for every collection, so its rate limit covers the whole upload
+    bulk_writer = db.bulk_writer(options=BULK_WRITER_OPTIONS)
+    bulk_writer.on_write_error(retry_failed_write)
     
-    # Upload each difficulty collection (skip easy - already uploaded)
-    for difficulty, word_list in words_by_difficulty.items():
-        collection_name = f"words_{difficulty}"
-        
-        # Skip easy words - already uploaded
-        if difficulty == "easy":
-            print(f"\nSkipping '{collection_name}' - already uploaded")
+    print(f"\nUploading words from {words_file}...")
+    for word_data in merge_senses(load_json(words_file)):
+        difficulty = word_data.get("difficulty", "Medium").lower()
+        i = counts.get(difficulty)  # Position within the difficulty's collection
+        if i is None:
             continue
+        counts[difficulty] = i + 1
         
-        print(f"\nUploading {len(word_list)} words to '{collection_name}'...")
+        # Merged senses often repeat synonyms; keep each one once, in order
+        for key in ("synonyms", "antonyms"):
+            word_data[key] = list(dict.fromkeys(word_data[key]))
         
-        batch = db.batch()
-        batch_count = 0
-        total_uploaded = 0
-        max_retries = 3
+        # Keep only the document fields, with defaults for any the record lacks
+        doc_data = DOC_DEFAULTS | {key: word_data[key] for key in DOC_DEFAULTS if key in word_data}
+        doc_data["index"] = i  # For random selection
         
-        for i, word_data in enumerate(word_list):
-            # Create document with word as ID (sanitized)
-            doc_id = f"{word_data['word']}_{i}"  # Add index to handle duplicates
-            doc_ref = db.collection(collection_name).document(doc_id)
-            
-            # Prepare document data
-            doc_data = {
-                "word": word_data.get("word", ""),
-                "pos": word_data.get("pos", ""),
-                "difficulty": word_data.get("difficulty", "Medium"),
-                "definitions": word_data.get("definitions", []),
-                "examples": word_data.get("examples", []),
-                "synonyms": word_data.get("synonyms", []),
-                "antonyms": word_data.get("antonyms", []),
-                "index": i  # For random selection
-            }
-            
-            batch.set(doc_ref, doc_data)
-            batch_count += 1
-            
-            # Commit batch when full
-            if batch_count >= BATCH_SIZE:
-                for attempt in range(max_retries):
-                    try:
-                        batch.commit()
-                        break
-                    except Exception as e:
-                        if attempt < max_retries - 1:
-                            print(f"  Retry {attempt + 1}/{max_retries}...")
-                            time.sleep(2 ** attempt)  # Exponential backoff
-                        else:
-                            print(f"  Error after {max_retries} retries: {e}")
-                            raise
-                
-                total_uploaded += batch_count
-                print(f"  Uploaded {total_uploaded}/{len(word_list)} words...")
-                batch = db.batch()
-                batch_count = 0
-                time.sleep(0.5)  # Small delay to avoid rate limits
+        # One document per word and part of speech
+        doc_id = f"{doc_data['word']}_{doc_data['pos']}"
+        doc_ids[difficulty].add(doc_id)
+        doc_ref = db.collection(f"words_{difficulty}").document(doc_id)
         
-        # Commit remaining documents
-        if batch_count > 0:
-            for attempt in range(max_retries):
-                try:
-                    batch.commit()
-                    break
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        print(f"  Retry {attempt + 1}/{max_retries}...")
-                        time.sleep(2 ** attempt)
-                    else:
-                        raise
-            total_uploaded += batch_count
-        
-        print(f"  ✓ Completed uploading to '{collection_name}'")
+        if not dry_run:
+            bulk_writer.set(doc_ref, doc_data)
+    
+    # Wait for every queued write (and its retries) to finish
+    bulk_writer.close()
+    exit_if_writes_failed()
+    
+    print(f"\nWord counts by difficulty:")
+    for diff, count in counts.items():
+        print(f"  {diff}: {count}")
+    
+    if dry_run:
+        if prune_stale:
+            stale = find_stale_documents(doc_ids)
+            print(f"\nWould delete {len(stale)} documents from earlier uploads")
+        print("\nDry run: nothing was written.")
+        return
+    
+    # Only clear out old documents once all the new ones are stored
+    if prune_stale:
+        stale = find_stale_documents(doc_ids)
+        print(f"\nDeleting {len(stale)} documents from earlier uploads...")
+        deleted = delete_documents(stale)
+        exit_if_writes_failed()
+        if deleted != len(stale):
+            print(f"\n✗ Upload failed: only {deleted} of {len(stale)} deletes were confirmed")
+            print("Word count metadata was not updated.")
+            sys.exit(1)
     
     # Store metadata with counts
     print("\nStoring word count metadata...")
@@ -136,11 +254,23 @@ def upload_words():
         "hard": counts["hard"],
         "total": sum(counts.values()),
         "updated_at": firestore.SERVER_TIMESTAMP
-    })
+    }, retry=WRITE_RETRY)
     
     print("\n✓ Upload complete!")
     print(f"Total words uploaded: {sum(counts.values())}")
 
 
 if __name__ == "__main__":
-    upload_words()
+    parser = argparse.ArgumentParser(description="Upload words to Firestore")
+    parser.add_argument(
+        "--prune-stale",
+        action="store_true",
+        help="delete word documents this upload didn't write (e.g. old per-sense documents)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="write nothing; report the counts, and the stale documents with --prune-stale"
+    )
+    args = parser.parse_args()
+    upload_words(prune_stale=args.prune_stale, dry_run=args.dry_run)